@@ -10,6 +10,13 @@ FN_UNPRESSED = 0
 FN_PRESSED_UNREAD = 1
 FN_PRESSED_READ = 2
 
+# Bits returned by Keyboard.read_bitmask()
+F1_MASK = 0x01
+F2_MASK = 0x02
+F3_MASK = 0x04
+F4_MASK = 0x08
+F5_MASK = 0x10
+
 
 class Keyboard:
     """
@@ -158,6 +165,29 @@ class Keyboard:
             return True
         return False
 
+    def read_bitmask(self) -> int:
+        """Checks all five function keys in one call, for apps that poll them every pass.
+        Returns the pressed keys as a bitmask of F1_MASK through F5_MASK, 0 if none.
+        Like f1() through f5(), each press is only reported once until released.
+        """
+        keys = 0
+        if self._f1 == FN_PRESSED_UNREAD:
+            self._f1 = FN_PRESSED_READ
+            keys |= F1_MASK
+        if self._f2 == FN_PRESSED_UNREAD:
+            self._f2 = FN_PRESSED_READ
+            keys |= F2_MASK
+        if self._f3 == FN_PRESSED_UNREAD:
+            self._f3 = FN_PRESSED_READ
+            keys |= F3_MASK
+        if self._f4 == FN_PRESSED_UNREAD:
+            self._f4 = FN_PRESSED_READ
+            keys |= F4_MASK
+        if self._f5 == FN_PRESSED_UNREAD:
+            self._f5 = FN_PRESSED_READ
+            keys |= F5_MASK
+        return keys
+
     async def read_hw(self):
         """Check TCA8418 for new key press/release events, and update
         the keybuffer and state of special keys.
@@ -21,6 +21,28 @@ _WIDTH = const(142)
 _HEIGHT = const(428)
 _OFFSET_X = const(0)
 _OFFSET_Y = const(12)
+## The driver's default draw buffer is a tenth of the screen, so redrawing a block of text
+## takes a handful of flushes. Two half-screen buffers (RGB565) let most updates go out in one
+## or two, and LVGL can render into one while the other is still being sent.
+_DRAW_BUF_SIZE = const(_WIDTH * _HEIGHT * 2 // 2)
+
+def _allocate_draw_buffers(display_bus):
+    ## Both buffers go in DMA-capable PSRAM: two half-screen buffers are ~119 KB, which would take most
+    ## of the internal DMA RAM the radio, SPI and the MicroPython heap also need.
+    ## allocate_framebuffer raises MemoryError when there's no room. If they don't both fit,
+    ## return (None, None) so the driver allocates its own (smaller) default buffer like it always has.
+    flags = lcd_bus.MEMORY_SPIRAM | lcd_bus.MEMORY_DMA
+    try:
+        frame_buffer1 = display_bus.allocate_framebuffer(_DRAW_BUF_SIZE, flags)
+        try:
+            frame_buffer2 = display_bus.allocate_framebuffer(_DRAW_BUF_SIZE, flags)
+        except MemoryError:
+            display_bus.free_framebuffer(frame_buffer1)
+            raise
+    except MemoryError:
+        print("Not enough memory for the larger draw buffers, using the display driver's default")
+        return None, None
+    return frame_buffer1, frame_buffer2
 
 async def lvgl_task_handler(th):
     while(True):
@@ -49,10 +71,14 @@ def lcd_init():
         cs=_LCD_CS_PIN
     )
 
+    frame_buffer1, frame_buffer2 = _allocate_draw_buffers(display_bus)
+
     display = nv3007.NV3007(
         data_bus=display_bus,
         display_width=_WIDTH,
         display_height=_HEIGHT,
+        frame_buffer1=frame_buffer1,
+        frame_buffer2=frame_buffer2,
         reset_pin=_LCD_RESET_PIN,
         reset_state=nv3007.STATE_LOW,
         backlight_pin=_LCD_BACKLIGHT_PIN,
@@ -22,14 +22,24 @@ BROADCAST_ADDRESS = 0xFFFFFFFF  # Broadcast address for all nodes
 RECENT_MESSAGE_EXPIRATION_S = 6000
 
 
+def _matches_version_filter(frame: bytes, version_filter) -> bool:
+    """Checks a received frame's payload against a receiver's (offset, value) version filter, if it has one."""
+    if version_filter is None:
+        return True
+    idx = HEADER_LEN + version_filter[0]
+    return idx < len(frame) and frame[idx] == version_filter[1]
+
+
 class BadgeNet:
     """Badge Network Stack"""
 
     def __init__(self):
         self.transmit_queue_max_len = 20
         self.transmit_queue: deque[NetworkFrame] = deque([], self.transmit_queue_max_len)
-        self.receive_callbacks: dict[int, list] = {}
+        self.receive_callbacks: dict[int, list] = {}  # port: [(callback, version_filter, structdef, payload_len)]
         self.protocols: dict[int, Protocol] = {0: NULL_PROTO}
+        # Payload length of each registered protocol, so received frames don't re-parse the structdef
+        self.payload_lens: dict[int, int] = {0: struct.calcsize(NULL_PROTO.structdef)}
         self.seen_nodes: dict[int, str] = {}
         self.capture_all_packets: bool = False
         self.promiscuous_queue: deque[NetworkFrame] = deque([], 100)
@@ -65,6 +75,7 @@ class BadgeNet:
                     raise ValueError(
                         f"Protocol {protocol.name} payload length is too large: {payload_len} bytes vs max of {max_payload_len} bytes."
                     )
+                self.payload_lens[port] = payload_len
             except ValueError as err:
                 raise ValueError(
                     f"Unable to use protocol {protocol.name}, illegal structdef: {err}"
@@ -82,13 +93,18 @@ class BadgeNet:
                     f"Redefining protocol at port {port} from {self.protocols[port]} to {protocol}."
                 )
 
-    def register_receiver(self, protocol: Protocol, callback=None):
-        """Registers a function to be called when a message is received for this badge in the specified protocol."""
+    def register_receiver(self, protocol: Protocol, callback=None, version_filter=None, structdef=None):
+        """Registers a function to be called when a message is received for this badge in the specified protocol.
+        version_filter is an optional (payload offset, value) pair. If given, the callback only gets messages whose
+        payload byte at that offset equals value, checked before the payload is decoded.
+        structdef optionally gives the payload layout this callback takes instead of the protocol's, e.g. an older
+        version of it picked out by version_filter. Its messages' payload is decoded with that layout."""
         port = protocol.port
         if callback is not None:
             if port not in self.receive_callbacks:
                 self.receive_callbacks[port] = []
-            self.receive_callbacks[port].append(callback)
+            payload_len = struct.calcsize(structdef) if structdef is not None else None
+            self.receive_callbacks[port].append((callback, version_filter, structdef, payload_len))
         self.register_protocol(protocol)
 
     async def recv_all(self):
@@ -126,20 +142,38 @@ class BadgeNet:
                     else:
                         # This message has been seen before, no need to reprocess it
                         continue
-                    message.deserialize(self.protocols)
+                    receivers = self.receive_callbacks.get(message.port)
+                    if not receivers or not message.check_for_me(MY_ADDRESS, BROADCAST_ADDRESS):
+                        continue
+                    # Check version filters and payload lengths against the raw frame so each receiver's payload is
+                    # only decoded with a layout that fits it, and messages no receiver wants are never decoded.
+                    receivers = [receiver for receiver in receivers if _matches_version_filter(message.frame, receiver[1])]
+                    if not receivers:
+                        continue
+                    payload_len = len(message.frame) - HEADER_LEN
+                    # If multiple protocols are defined on the same port by different badges, only
+                    # send the message to the app if it matches the app's protocol definition for this port.
+                    protocol_fits = payload_len == self.payload_lens.get(message.port)
+                    message.deserialize(
+                        self.protocols,
+                        decode_payload=protocol_fits and any(receiver[2] is None for receiver in receivers),
+                    )
                     # print(f"Decoded frame {repr(message)}")
-                    if message.check_for_me(MY_ADDRESS, BROADCAST_ADDRESS):
-                        if message.port in self.receive_callbacks and len(
-                            message.payload_bytes
-                        ) == struct.calcsize(message.protocol.structdef):
-                            # If multiple protocols are defined on the same port by different badges, only
-                            # send the message to the app if it matches the app's protocol definition for this port.
-                            for callback in self.receive_callbacks[message.port]:
-                                try:
-                                    callback(message)
-                                except Exception as ex:
-                                    print(f"Exception in callback for message in protocol {message.protocol.name}")
-                                    sys.print_exception(ex)
+                    protocol_payload = message.payload
+                    for callback, _, structdef, structdef_len in receivers:
+                        if structdef is None:
+                            if not protocol_fits:
+                                continue
+                            message.payload = protocol_payload
+                        elif payload_len == structdef_len:
+                            message.payload = struct.unpack_from(structdef, message.frame, HEADER_LEN)
+                        else:
+                            continue
+                        try:
+                            callback(message)
+                        except Exception as ex:
+                            print(f"Exception in callback for message in protocol {message.protocol.name}")
+                            sys.print_exception(ex)
             except Exception as exc:
                 print("Recv error:", exc)
                 raise
@@ -215,9 +249,11 @@ class BadgeNet:
 badgenet = BadgeNet()
 
 
-def register_receiver(protocol: Protocol, callback=None):
-    """Register a callback for incoming messages on a specific port."""
-    badgenet.register_receiver(protocol, callback)
+def register_receiver(protocol: Protocol, callback=None, version_filter=None, structdef=None):
+    """Register a callback for incoming messages on a specific port.
+    Optionally only for messages whose payload byte at version_filter[0] equals version_filter[1],
+    and decoded with structdef rather than the protocol's (e.g. for an older version of the protocol)."""
+    badgenet.register_receiver(protocol, callback, version_filter, structdef)
 
 
 def register_protocol(protocol: Protocol):
@@ -54,7 +54,7 @@ class NetworkFrame:
         self.port: int = 0
         self.seq_num: int = 0
         self.payload: tuple | list = []
-        self.payload_bytes: bytes = b""
+        self.payload_bytes: bytes | bytearray = b""
         self.ttl: int = 0
         self.checksum: int = 0
         self.frame: bytes = b""
@@ -78,7 +78,7 @@ class NetworkFrame:
         self,
         protocol: Protocol,
         destination: int,
-        payload: bytes | tuple | list,
+        payload: bytes | bytearray | tuple | list,
         source: int = 0,
         ttl: int = 0,
     ):
@@ -86,7 +86,8 @@ class NetworkFrame:
         self.port = protocol.port
         self.source = source
         self.destination = destination
-        if isinstance(payload, bytes):
+        if isinstance(payload, (bytes, bytearray)):
+            # Already packed (e.g. with struct.pack_into into a reused buffer); copied into the frame on serialize.
             self.payload_bytes = payload
         elif isinstance(payload, (tuple, list)):
             self.payload = payload
@@ -95,8 +96,10 @@ class NetworkFrame:
                 f"payload needs to be a tuple/list of arguments or the byte array. Got {type(payload)}: [{repr(payload)}]"
             )
         self.ttl = ttl if 0 <= ttl < 15 else 0
-        if not self.timestamp:
-            self.timestamp = time.time() # type: ignore
+        self.timestamp = time.time() # type: ignore
+        # Drop any previous serialization so a frame object can be reused for the next send
+        self.frame = b""
+        self.validated_frame = False
         self.fields_set = True
         global global_sequence
         self.seq_num = global_sequence
@@ -160,7 +163,7 @@ class NetworkFrame:
         flags_ttl = 0 | self.ttl
         if isinstance(self.payload, (tuple, list)) and self.payload:
             payload = struct.pack(self.protocol.structdef, *self.payload)
-        elif isinstance(self.payload_bytes, bytes):
+        elif isinstance(self.payload_bytes, (bytes, bytearray)):
             payload_max_len = struct.calcsize(self.protocol.structdef)
             payload_len = len(self.payload_bytes)
             if payload_len > payload_max_len:
@@ -205,7 +208,7 @@ class NetworkFrame:
         self.validate_frame()
         return frame
 
-    def deserialize(self, protocols: dict[int, Protocol]):
+    def deserialize(self, protocols: dict[int, Protocol], decode_payload: bool = True):
         # If already deserialized, return.
         if self.fields_set:
             return self
@@ -227,6 +230,11 @@ class NetworkFrame:
         self.payload_bytes = frame[HEADER_LEN:]
         try:
             self.protocol = protocols[self.port]
+            # The caller may decode the payload itself, e.g. with an older layout of the protocol. Leave fields_set
+            # clear so a later deserialize() (e.g. badgeshark) still decodes it with the protocol's layout.
+            if not decode_payload:
+                self.payload = []
+                return self
             try:
                 self.payload = struct.unpack_from(
                     self.protocol.structdef, frame, HEADER_LEN
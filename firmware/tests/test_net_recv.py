@@ -0,0 +1,102 @@
+"""Host-side checks for BadgeNet receive dispatch. Run from firmware/ with: python -m unittest discover tests"""
+
+import asyncio
+import binascii
+import contextlib
+import io
+import os
+import sys
+import traceback
+import types
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "badge"))
+
+# machine and the CRC library only exist on the badge; stand in for them on the host.
+_machine = types.ModuleType("machine")
+_machine.unique_id = lambda: b"\x00\x00\x01\x02\x03\x04"
+sys.modules.setdefault("machine", _machine)
+
+
+class _Crc16Xmodem:
+    def __init__(self, _config):
+        pass
+
+    def checksum(self, data):
+        return binascii.crc_hqx(bytes(data), 0)
+
+
+_crc = types.ModuleType("libs.crc")
+_crc.Calculator = _Crc16Xmodem
+_crc.Crc16 = types.SimpleNamespace(xmodem=None)
+sys.modules.setdefault("libs.crc", _crc)
+if not hasattr(sys, "print_exception"):
+    sys.print_exception = traceback.print_exception
+
+from net import net  # noqa: E402
+from net.protocols import NetworkFrame, Protocol  # noqa: E402
+
+# The air quality app's atmosphere protocol: v2 is current, v0 and v1 are older layouts kept for old badges.
+ATMOS_STRUCTDEFS = {0: ">Bfff", 1: ">Bffffffff", 2: ">BHhBHHHHH"}
+ATMOS_PROTOCOL = Protocol(port=25, name="atmosphere", structdef=ATMOS_STRUCTDEFS[2])
+PAYLOADS = {
+    0: (0, 800.0, 21.5, 40.0),
+    1: (1, 800.0, 21.5, 40.0, 1.0, 2.0, 3.0, 4.0, 5.0),
+    2: (2, 800, 2150, 80, 10, 20, 30, 40, 50),
+}
+
+
+def _frame(version):
+    protocol = Protocol(ATMOS_PROTOCOL.port, ATMOS_PROTOCOL.name, ATMOS_STRUCTDEFS[version])
+    message = NetworkFrame().set_fields(protocol, net.BROADCAST_ADDRESS, PAYLOADS[version], source=0x55)
+    message.serialize()
+    return message.frame
+
+
+class _Lora:
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    async def recv(self):
+        if self.frames:
+            return self.frames.pop(0)
+        raise StopAsyncIteration
+
+
+class RecvAllTest(unittest.TestCase):
+    def _receive(self, frames):
+        badgenet = net.BadgeNet()
+        received = []
+        for version, structdef in ATMOS_STRUCTDEFS.items():
+            badgenet.register_receiver(
+                ATMOS_PROTOCOL,
+                lambda message, version=version: received.append((version, message.payload)),
+                version_filter=(0, version),
+                structdef=None if structdef == ATMOS_PROTOCOL.structdef else structdef,
+            )
+        badgenet.badge = types.SimpleNamespace(lora=_Lora(frames))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), self.assertRaises(StopAsyncIteration):
+            asyncio.run(badgenet.recv_all())
+        # recv_all logs the exception _Lora ends the stream with on its way out.
+        return received, output.getvalue().replace("Recv error: \n", "")
+
+    def test_every_version_decoded_with_its_layout(self):
+        received, output = self._receive(_frame(version) for version in (0, 1, 2))
+        self.assertEqual([version for version, _ in received], [0, 1, 2])
+        for version, payload in received:
+            self.assertEqual(tuple(payload), PAYLOADS[version])
+        self.assertEqual(output, "")
+
+    def test_version_byte_with_wrong_length_dropped(self):
+        # A v1-sized frame that claims to be v2 matches no layout and must not reach a receiver.
+        protocol = Protocol(ATMOS_PROTOCOL.port, ATMOS_PROTOCOL.name, ATMOS_STRUCTDEFS[1])
+        message = NetworkFrame().set_fields(protocol, net.BROADCAST_ADDRESS, (2,) + PAYLOADS[1][1:], source=0x55)
+        message.serialize()
+        received, output = self._receive([message.frame])
+        self.assertEqual(received, [])
+        self.assertEqual(output, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
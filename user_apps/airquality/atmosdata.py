@@ -1,18 +1,104 @@
 
+from array import array
 import uasyncio as aio  # type: ignore
 
 from apps.base_app import BaseApp
+from hardware.keyboard import F5_MASK
 from libs.micropython_scd30.scd30 import SCD30
 from libs.sps30_micropython.sps30 import SPS30
-from net.net import register_receiver, send, BROADCAST_ADDRESS
+from net.net import register_protocol, register_receiver, send, BROADCAST_ADDRESS
 from net.protocols import Protocol, NetworkFrame
 from ui.page import Page
 import ui.styles as styles
 import lvgl
-import utime
+import micropython
+from micropython import const
+import struct
+import sys
+from urandom import getrandbits
+from utime import ticks_add, ticks_diff, ticks_ms
 
+_SCD30_ADDRESS = const(0x61)
+_SPS30_ADDRESS = const(0x69)
+_ATMOS_PORT = const(25)
+_SENSOR_REFRESH_INTERVAL_MS = const(5000)
+# How early to start checking for a measurement, to absorb drift between our clock and the sensor's
+_SENSOR_READY_MARGIN_MS = const(200)
+# How soon to check again when the sensor wasn't ready yet
+_SENSOR_RETRY_MS = const(100)
+# After an I2C error, wait at least this long before trying the sensors again, doubling per failure up to the max
+_I2C_BACKOFF_MIN_MS = const(500)
+_I2C_BACKOFF_MAX_MS = const(30000)
+# What the sensors raise when they drop off the bus (OSError from I2C) or a reply is garbled. The SCD30 driver
+# has its own exceptions for both; the SPS30 driver defines none, so its bad replies surface as ValueError.
+_SENSOR_ERRORS = (OSError, ValueError, SCD30.CRCException, SCD30.NotFoundException)
+_FOREGROUND_SLEEP_MS = const(10)
+# Per-measurement debug output over the REPL UART; const so the prints compile out when off
+_VERBOSE = const(False)
+# Broadcasts are rate limited by a token bucket: one token per measurement interval, and up to this many
+# saved up, so a reading that lands a little early (clock drift, jitter) isn't held back.
+_TX_TOKEN_INTERVAL_MS = const(_SENSOR_REFRESH_INTERVAL_MS)
+_TX_BUCKET_DEPTH = const(2)
+
+# Payload layout for each version of the broadcast; the first byte is always the version.
+# Every version here is received, with the network stack picking the layout by that byte.
+# v0: c02, temp, hum
+# v1: add five particle count buckets
+# v2: same readings as fixed point integers instead of floats, to halve the airtime (16 bytes vs 33)
+ATMOS_STRUCTDEFS = {
+    0: ">Bfff",
+    1: ">Bffffffff",
+    2: ">BHhBHHHHH",
+}
+ATMOS_VERSION = const(2)
 # Yes, this is a Doctor Who reference
-ATMOS_PROTOCOL = Protocol(port=25, name="AtmosphereData", structdef="!Bffffffff")
+ATMOS_PROTOCOL = Protocol(port=_ATMOS_PORT, name="AtmosphereData", structdef=ATMOS_STRUCTDEFS[ATMOS_VERSION])
+# One label per entry returned by compose_lines()
+DISPLAY_LINES = const(8)
+# Lines before this are the SCD30's (CO2, temperature, humidity), the rest are particle counts
+_FIRST_PARTICLE_LINE = const(3)
+# LVGL lays the lines out as two flex columns side by side, the SCD30's and then the particle counts
+_LINE_COLUMNS = ((0, _FIRST_PARTICLE_LINE), (_FIRST_PARTICLE_LINE, DISPLAY_LINES))
+_CONTENT_PAD_LEFT = const(25)
+_COLUMN_GAP = const(20)
+# Changes smaller than these don't show on screen: ppm CO2, deg C, % rh
+CO2_DISPLAY_EPSILON = (0.5, 0.005, 0.05)
+# The SPS30 reports 4 mass concentrations, then these 5 number concentrations, then typical particle size
+_SPS30_COUNT_OFFSET = const(4)
+PARTICLE_BUCKETS = const(5)
+# Where each group of measurements starts in the broadcast payload, after the version byte
+_PAYLOAD_CO2_OFFSET = const(1)
+_PAYLOAD_PARTICLE_OFFSET = const(4)
+# v2 fields are the reading times its scale, rounded. In the unsigned fields the all-ones value
+# means no reading (-1.0 here); temperature is signed, and -1.0 deg C fits as is.
+_TEMP_SCALE = const(100) # hundredths of a deg C
+_RH_SCALE = const(2) # half percent rh
+_PARTICLE_SCALE = const(10) # tenths of a particle/cm^3
+_U8_MISSING = const(0xFF)
+_U16_MISSING = const(0xFFFF)
+# (scale, missing value) for ppm CO2, deg C, % rh
+_CO2_FIELDS = ((1, _U16_MISSING), (_TEMP_SCALE, None), (_RH_SCALE, _U8_MISSING))
+# 9 / 5, for deg C -> deg F
+C_TO_F_SCALE = 1.8
+# Infobar status text, depending on whether we have sensors or are listening for other badges
+_POLLING_BANNER = f"Polling sensors every ~{_SENSOR_REFRESH_INTERVAL_MS // 1000}s"
+_AWAITING_BANNER = "Awaiting packets"
+
+def _quantize(value: float, scale: int, missing) -> int:
+    """Convert a reading to its v2 fixed point field, clamped to the field's range.
+    Values are range checked before rounding, since round() raises on NaN and inf."""
+    scaled = value * scale
+    if missing is None:
+        if not -0x8000 < scaled < 0x7FFF: # out of range, or NaN
+            return 0x7FFF if scaled > 0 else -0x8000
+        return round(scaled)
+    if not scaled >= 0: # no reading, or NaN
+        return missing
+    return round(scaled) if scaled < missing - 1 else missing - 1
+
+def _dequantize(raw: int, scale: int, missing) -> float:
+    """Convert a v2 fixed point field back to the reading."""
+    return -1.0 if raw == missing else raw / scale
 
 class AtmosphereData(BaseApp):
     """ This class either receives and displays atmosphere data (think air quality/AQI)
@@ -24,151 +110,289 @@ class AtmosphereData(BaseApp):
     def __init__(self, name: str, badge):
         super().__init__(name, badge)
 
-        self.sensor_refresh_interval_ms = 5000
-        scd30_address = 0x61
-        sps30_address = 0x69
-        # v0: c02, temp, hum
-        # v1: add five particle count buckets
-        self.ATMOS_VERSION = 1
-
-        self.foreground_sleep_ms = 10
-        self.background_sleep_ms = self.sensor_refresh_interval_ms
+        self.foreground_sleep_ms = _FOREGROUND_SLEEP_MS
+        self.background_sleep_ms = _SENSOR_REFRESH_INTERVAL_MS
 
         i2c_scan_result = self.badge.sao_i2c.scan()
 
-        if scd30_address in i2c_scan_result:
-            self.scd30 = SCD30(self.badge.sao_i2c, scd30_address) # leave internal sleep at default 1000us
-            self.scd30.set_measurement_interval(int(self.sensor_refresh_interval_ms/1000))
+        if _SCD30_ADDRESS in i2c_scan_result:
+            self.scd30 = SCD30(self.badge.sao_i2c, _SCD30_ADDRESS) # leave internal sleep at default 1000us
+            self.scd30.set_measurement_interval(_SENSOR_REFRESH_INTERVAL_MS // 1000)
             self.producing_data = True
         else:
             self.scd30 = None
             self.producing_data = False
 
-        if sps30_address in i2c_scan_result:
-            self.sps30 = SPS30(self.badge.sao_i2c, sps30_address)
+        if _SPS30_ADDRESS in i2c_scan_result:
+            self.sps30 = SPS30(self.badge.sao_i2c, _SPS30_ADDRESS)
             self.sps30.start_measurement()
             #self.sps30 = None
         else:
             self.sps30 = None
 
-        self.co2_measurement = [-1, -1, -1]
-        self.particle_measurement = []
-        for idx in range(0,4+5+2):
-            self.particle_measurement.append(["",-1.0]) # incomplete dummy data
-        self.screen_has_latest_data = True
-        self.last_transmission = 0
+        # Fixed float buffers that readings are copied into, rather than lists of boxed floats
+        # co2, temp, rh
+        self.co2_measurement = array("f", (-1.0, -1.0, -1.0))
+        # particles/cm^3 per size bucket, with the units the SPS30 reports for each (unknown for received data)
+        self.particle_measurement = array("f", (-1.0,) * PARTICLE_BUCKETS)
+        self.particle_units = [""] * PARTICLE_BUCKETS
+        # Set by the sensor task or the receiver when the screen is behind the measurements
+        self._new_data = aio.Event()
+        # Token bucket kept as ms of credit, one token being _TX_TOKEN_INTERVAL_MS, so refilling it is small-int
+        # math and the broadcast path doesn't allocate floats. Start with a token so the first reading goes out.
+        self._tx_credit_ms = _TX_TOKEN_INTERVAL_MS
+        self._tx_credit_updated = ticks_ms()
+        # Packed in place on every transmission rather than building a tuple of floats each time
+        self._tx_buf = bytearray(struct.calcsize(ATMOS_PROTOCOL.structdef))
+        # The sensors only produce a new measurement once per interval, so rather than asking them
+        # if they're ready every tick, a task sleeps until the next measurement should be available.
+        self._next_ready_ms = ticks_ms()
+        self._i2c_backoff_ms = 0
+        self.sensor_task = None
 
         self.current_line_labels = []
+        self._last_texts = []
+        # Lines are only reformatted for the group of measurements that changed since they were composed
+        self._cached_lines = [""] * DISPLAY_LINES
+        self._dirty_co2 = True
+        self._dirty_particles = True
+        # CO2 values the cached lines were formatted from
+        self._last_co2_measurement = array("f", (0.0, 0.0, 0.0))
 
     def start(self):
         super().start()
-        register_receiver(ATMOS_PROTOCOL, self.receive_message)
+        if self.producing_data:
+            # We only display our own sensors, so don't have the network stack decode other badges' data for us
+            register_protocol(ATMOS_PROTOCOL)
+            if self.sensor_task is None:
+                self.sensor_task = aio.create_task(self._sensor_task())
+        else:
+            # Frames are matched to a version of this app before they're decoded, and the network stack
+            # decodes older versions with their own layout for us.
+            for version, structdef in ATMOS_STRUCTDEFS.items():
+                register_receiver(ATMOS_PROTOCOL, self.receive_message, version_filter=(0, version),
+                                  structdef=None if version == ATMOS_VERSION else structdef)
 
     def receive_message(self, message: NetworkFrame):
         """Handle incoming messages."""
-        print(f"atmos received message {message.payload}")
-        # TODO do this check for register_receiver instead (this is easier to debug)
-        if not self.producing_data and message.port == ATMOS_PROTOCOL.port and message.payload[0] == self.ATMOS_VERSION:
-            self.co2_measurement = message.payload[1:3]
-            self.particle_measurement = message.payload[4:8]
-            self.screen_has_latest_data = False
+        if _VERBOSE:
+            print(f"atmos received message {message.payload}")
+        # Only registered when not producing data; port and version are already checked by register_receiver
+        # The net stack has already unpacked the frame once, so decode its fields straight into the
+        # existing measurement slots; payload is (version, co2, temp, rh, 5 particle counts),
+        # fixed point for the current version and floats for older ones. v0 has no particle counts.
+        payload = message.payload
+        quantized = payload[0] == ATMOS_VERSION
+        co2 = self.co2_measurement
+        for idx in range(3):
+            value = payload[_PAYLOAD_CO2_OFFSET + idx]
+            if quantized:
+                scale, missing = _CO2_FIELDS[idx]
+                value = _dequantize(value, scale, missing)
+            if co2[idx] != value:
+                co2[idx] = value
+                self._dirty_co2 = True
+        particles = self.particle_measurement
+        for idx in range(PARTICLE_BUCKETS if len(payload) > _PAYLOAD_PARTICLE_OFFSET else 0):
+            value = payload[_PAYLOAD_PARTICLE_OFFSET + idx]
+            if quantized:
+                value = _dequantize(value, _PARTICLE_SCALE, _U16_MISSING)
+            if particles[idx] != value:
+                particles[idx] = value
+                self._dirty_particles = True
+        if self._dirty_co2 or self._dirty_particles:
+            self._new_data.set()
+
+    async def _sensor_task(self):
+        """Read the sensors once per measurement interval, independent of the UI tick rate.
+        Runs until the app is stopped (neither foreground nor background)."""
+        while self.producing_data and (self.active_foreground or self.active_background):
+            await aio.sleep_ms(max(0, ticks_diff(self._next_ready_ms, ticks_ms())))
+            try:
+                self.poll_data()
+            except Exception as exc:
+                # Nothing else should end sensor reads for good either; report it and try again later
+                self._back_off(ticks_ms())
+                print(f"atmos sensor task error, retrying in {self._i2c_backoff_ms}ms")
+                sys.print_exception(exc)
+        # Let start() create a new one if the app is started again
+        self.sensor_task = None
 
     def poll_data(self):
         # safety
         if not self.producing_data:
             return
+        # Don't spend an I2C round-trip asking for data that can't be there yet.
+        now = ticks_ms()
+        if ticks_diff(now, self._next_ready_ms) < 0:
+            return
+        # A few ms of jitter keeps badges that started together from broadcasting in lockstep
+        self._next_ready_ms = ticks_add(now, _SENSOR_REFRESH_INTERVAL_MS - _SENSOR_READY_MARGIN_MS + getrandbits(4))
         # This scd30 driver isn't very resilient to the device falling off the bus sometimes,
-        # but this is a wearable so we just deal with it.
+        # but this is a wearable so we just deal with it: back off so a missing sensor isn't hammered.
         try:
-            transmit_new_data = False
-            now = utime.ticks_ms()
-            if self.scd30 and self.scd30.get_status_ready():
-                self.screen_has_latest_data = False
-                transmit_new_data = True
-                print(f"co2: {self.co2_measurement}")
-                self.co2_measurement = self.scd30.read_measurement()
-            if self.sps30 and self.sps30.read_data_ready():
-                self.screen_has_latest_data = False
-                transmit_new_data = True
-                self.particle_measurement = self.sps30.read_measurement()
-                print(f"part: {self.particle_measurement}")
-            if transmit_new_data and (now - self.last_transmission) > self.sensor_refresh_interval_ms:
-                tx_msg = NetworkFrame().set_fields(protocol=ATMOS_PROTOCOL,
-                                                destination=BROADCAST_ADDRESS,
-                                                payload=(
-                                                    int(self.ATMOS_VERSION), # version
-                                                    float(self.co2_measurement[0]), # ppm CO2
-                                                    float(self.co2_measurement[1]), # deg C
-                                                    float(self.co2_measurement[2]), # percent relative humidity
-                                                    float(self.particle_measurement[4][1]), # particles/cm^3
-                                                    float(self.particle_measurement[5][1]), # particles/cm^3
-                                                    float(self.particle_measurement[6][1]), # particles/cm^3
-                                                    float(self.particle_measurement[7][1]), # particles/cm^3
-                                                    float(self.particle_measurement[8][1]), # particles/cm^3
-                                                ))
-                self.badge.lora.send(tx_msg)
-                print("ATMOS transmitted")
-                self.last_transmission = now
-        except:
-            print("scd30 read failure")
+            new_co2 = self._poll_scd30(now)
+            self._poll_sps30()
+        except _SENSOR_ERRORS:
+            self._back_off(now)
+            print(f"atmos sensor read failure, retrying in {self._i2c_backoff_ms}ms")
+            return
+        self._i2c_backoff_ms //= 2
+        if self._dirty_co2 or self._dirty_particles:
+            self._new_data.set()
+        # Broadcast once per cycle, right after the SCD30's new reading, so a packet never carries the
+        # previous cycle's CO2; particle counts read in between go out with it. The SCD30 is what makes
+        # this badge a producer, so there's always one here.
+        if new_co2 and self._take_tx_token(now):
+            self._transmit()
+
+    def _back_off(self, now: int) -> None:
+        """Put off the next sensor read, twice as long as last time if the previous attempt failed too."""
+        self._i2c_backoff_ms = min(_I2C_BACKOFF_MAX_MS, max(_I2C_BACKOFF_MIN_MS, self._i2c_backoff_ms * 2))
+        self._next_ready_ms = ticks_add(now, self._i2c_backoff_ms)
+
+    def _poll_scd30(self, now: int) -> bool:
+        """Read CO2, temperature, and humidity if the SCD30 has a new measurement. Returns whether it did."""
+        if not self.scd30:
+            return False
+        if not self.scd30.get_status_ready():
+            # Woke up a little ahead of the sensor; check back shortly rather than a full interval later
+            self._next_ready_ms = ticks_add(now, _SENSOR_RETRY_MS)
+            return False
+        if _VERBOSE:
+            print(f"co2: {self.co2_measurement}")
+        measurement = self.scd30.read_measurement()
+        for idx in range(3):
+            if self.co2_measurement[idx] != measurement[idx]:
+                self.co2_measurement[idx] = measurement[idx]
+                self._dirty_co2 = True
+        return True
+
+    def _poll_sps30(self) -> bool:
+        """Read particle counts if the SPS30 has a new measurement. Returns whether it did."""
+        if not self.sps30 or not self.sps30.read_data_ready():
+            return False
+        # Entries are [units, value]; keep just the number concentrations.
+        # The units never change, so they're only picked up from the first reading.
+        measurement = self.sps30.read_measurement()
+        if not self.particle_units[0]:
+            for idx in range(PARTICLE_BUCKETS):
+                self.particle_units[idx] = measurement[_SPS30_COUNT_OFFSET + idx][0]
+            self._dirty_particles = True
+        for idx in range(PARTICLE_BUCKETS):
+            value = measurement[_SPS30_COUNT_OFFSET + idx][1]
+            if self.particle_measurement[idx] != value:
+                self.particle_measurement[idx] = value
+                self._dirty_particles = True
+        if _VERBOSE:
+            print(f"part: {self.particle_measurement}")
+        return True
+
+    def _take_tx_token(self, now: int) -> bool:
+        """Refill the broadcast token bucket for the time elapsed and take a token if one is available."""
+        elapsed = ticks_diff(now, self._tx_credit_updated)
+        self._tx_credit_updated = now
+        self._tx_credit_ms = min(_TX_BUCKET_DEPTH * _TX_TOKEN_INTERVAL_MS, self._tx_credit_ms + elapsed)
+        if self._tx_credit_ms < _TX_TOKEN_INTERVAL_MS:
+            return False
+        self._tx_credit_ms -= _TX_TOKEN_INTERVAL_MS
+        return True
+
+    def _transmit(self):
+        """Broadcast the current measurements."""
+        co2 = self.co2_measurement
+        particles = self.particle_measurement
+        struct.pack_into(ATMOS_PROTOCOL.structdef, self._tx_buf, 0,
+                         ATMOS_VERSION, # version
+                         _quantize(co2[0], 1, _U16_MISSING), # ppm CO2
+                         _quantize(co2[1], _TEMP_SCALE, None), # deg C
+                         _quantize(co2[2], _RH_SCALE, _U8_MISSING), # percent relative humidity
+                         _quantize(particles[0], _PARTICLE_SCALE, _U16_MISSING), # particles/cm^3
+                         _quantize(particles[1], _PARTICLE_SCALE, _U16_MISSING), # particles/cm^3
+                         _quantize(particles[2], _PARTICLE_SCALE, _U16_MISSING), # particles/cm^3
+                         _quantize(particles[3], _PARTICLE_SCALE, _U16_MISSING), # particles/cm^3
+                         _quantize(particles[4], _PARTICLE_SCALE, _U16_MISSING), # particles/cm^3
+                         )
+        # A new frame with its own copy of the payload: the transmit and badgeshark queues hold on to
+        # the frame, so it mustn't change under them when the next broadcast is packed.
+        send(NetworkFrame().set_fields(protocol=ATMOS_PROTOCOL,
+                                       destination=BROADCAST_ADDRESS,
+                                       payload=bytes(self._tx_buf)))
+        if _VERBOSE:
+            print("ATMOS transmitted")
 
+    @micropython.native
+    def _co2_display_unchanged(self) -> bool:
+        """Whether the CO2 measurements would format the same as the cached lines.
+        Written as not-less-than so a NaN on either side (a missing reading) counts as changed."""
+        for idx in range(3):
+            if not abs(self.co2_measurement[idx] - self._last_co2_measurement[idx]) < CO2_DISPLAY_EPSILON[idx]:
+                return False
+        return True
+
+    @micropython.native
     def compose_lines(self) -> list[str]:
-        l = []
-        l.append(f"{self.co2_measurement[0]:.0f} ppm CO2")
-        l.append(f"{self.co2_measurement[1]:.2f} deg C ({(self.co2_measurement[1] * 9 / 5) + 32:.0f} deg F)")
-        l.append(f"{self.co2_measurement[2]}% rh")
-        l.append(f"{self.particle_measurement[4][1]} {self.particle_measurement[4][0]} particles/cm^3")
-        l.append(f"{self.particle_measurement[5][1]} {self.particle_measurement[5][0]} particles/cm^3")
-        l.append(f"{self.particle_measurement[6][1]} {self.particle_measurement[6][0]} particles/cm^3")
-        l.append(f"{self.particle_measurement[7][1]} {self.particle_measurement[7][0]} particles/cm^3")
-        l.append(f"{self.particle_measurement[8][1]} {self.particle_measurement[8][0]} particles/cm^3")
+        """Returns the display lines, reformatting only the ones whose measurements changed."""
+        l = self._cached_lines
+        if self._dirty_co2:
+            self._dirty_co2 = False
+            if not l[0] or not self._co2_display_unchanged():
+                co2 = self.co2_measurement
+                last = self._last_co2_measurement
+                for idx in range(3):
+                    last[idx] = co2[idx]
+                deg_c = co2[1]
+                l[0] = f"{co2[0]:.0f} ppm CO2"
+                l[1] = f"{deg_c:.2f} deg C ({deg_c * C_TO_F_SCALE + 32:.0f} deg F)"
+                l[2] = f"{co2[2]:.1f}% rh"
+        if self._dirty_particles:
+            self._dirty_particles = False
+            particles = self.particle_measurement
+            units = self.particle_units
+            l[3] = f"{particles[0]} {units[0]} particles/cm^3"
+            l[4] = f"{particles[1]} {units[1]} particles/cm^3"
+            l[5] = f"{particles[2]} {units[2]} particles/cm^3"
+            l[6] = f"{particles[3]} {units[3]} particles/cm^3"
+            l[7] = f"{particles[4]} {units[4]} particles/cm^3"
         return l
 
     def refresh_labels(self) -> None:
-        # I should be able to get LVGL to do vertical stacking for me
-        # Many thanks to hwmon for showing how to do some of this
-        y_pos = 18
-        for label in self.current_line_labels:
-            label.delete()
-        self.current_line_labels = []
-        text_to_display = self.compose_lines()
-        for text in text_to_display:
-            label = lvgl.label(self.badge.display.screen)
-            self.current_line_labels.append(label)
-            label.set_text(text)
-            label.set_pos(25, y_pos)
-            y_pos += 13
+        # Labels are created once in switch_to_foreground; only touch the ones whose text changed,
+        # and don't even compare the group of lines whose measurements weren't updated.
+        # Invalidation is held off while the batch is applied, then the content area (which holds every label,
+        # at its old size and its new one) is marked dirty once rather than per label, or the whole screen.
+        first = 0 if self._dirty_co2 else _FIRST_PARTICLE_LINE
+        end = DISPLAY_LINES if self._dirty_particles else _FIRST_PARTICLE_LINE
+        lines = self.compose_lines()
+        labels = self.current_line_labels
+        last_texts = self._last_texts
+        disp = lvgl.display_get_default()
+        disp.enable_invalidation(False)
+        changed = False
+        try:
+            for idx in range(first, end):
+                text = lines[idx]
+                if text != last_texts[idx]:
+                    last_texts[idx] = text
+                    labels[idx].set_text(text)
+                    changed = True
+        finally:
+            disp.enable_invalidation(True)
+        if changed:
+            self.p.content.invalidate()
 
     def run_foreground(self):
-        if self.producing_data:
-            self.poll_data()
-        else:
-            pass # Wait for lora packets
-
-        if not self.screen_has_latest_data:
-            self.screen_has_latest_data = True
+        # Sensors are read by _sensor_task, and lora packets arrive via receive_message
+        if self._new_data.is_set():
+            self._new_data.clear()
             self.refresh_labels()
 
-        if self.badge.keyboard.f1():
-            pass
-        if self.badge.keyboard.f2():
-            pass
-        if self.badge.keyboard.f3():
-            pass
-        if self.badge.keyboard.f4():
-            pass
+        keys = self.badge.keyboard.read_bitmask()
         ## Co-op multitasking: all you have to do is get out
-        if self.badge.keyboard.f5():
+        if keys & F5_MASK:
             self.badge.display.clear()
             self.switch_to_background()
 
-    def run_background(self):
-        super().run_background()
-        if self.producing_data:
-            self.poll_data()
-        else:
-            pass # Wait for lora packets
-
     def switch_to_foreground(self):
         super().switch_to_foreground()
         self.p = Page()
@@ -178,14 +402,32 @@ class AtmosphereData(BaseApp):
         self.p.create_content()
         self.p.create_menubar(["", "", "", "", "Done"])
         self.p.replace_screen()
-        if not self.producing_data:
-            self.p.infobar_right.set_text("Awaiting packets")
-        else:
-            self.p.infobar_right.set_text(f"Polling sensors every ~{int(self.sensor_refresh_interval_ms/1000)}s")
-        self.screen_has_latest_data = False
+        self.p.infobar_right.set_text(_POLLING_BANNER if self.producing_data else _AWAITING_BANNER)
+        # Many thanks to hwmon for showing how to do some of this
+        # The labels belong to the page's content, so LVGL deletes them along with the page.
+        content = self.p.content
+        content.set_flex_flow(lvgl.FLEX_FLOW.ROW)
+        content.set_style_pad_left(_CONTENT_PAD_LEFT, 0)
+        content.set_style_pad_column(_COLUMN_GAP, 0)
+        self.current_line_labels = []
+        for first, end in _LINE_COLUMNS:
+            column = lvgl.obj(content)
+            column.set_scrollbar_mode(0)
+            column.add_style(styles.content_style, 0)
+            column.set_size(lvgl.SIZE_CONTENT, lvgl.SIZE_CONTENT)
+            column.set_flex_flow(lvgl.FLEX_FLOW.COLUMN)
+            column.set_style_pad_row(0, 0)
+            for _ in range(first, end):
+                self.current_line_labels.append(lvgl.label(column))
+        self._last_texts = [""] * len(self.current_line_labels)
+        # The new labels are blank, so every line needs setting whether or not it changed
+        self._dirty_co2 = True
+        self._dirty_particles = True
+        self._new_data.set()
 
     def switch_to_background(self):
-        # TODO: If the LVGL objects are properly parented, this loop may not be necessary.
+        # The labels went with the page (display.clear() or the next page's replace_screen()); just drop our references
         self.current_line_labels = []
+        self._last_texts = []
         self.p = None
         super().switch_to_background()